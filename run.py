@@ -225,6 +225,15 @@ if __name__ == "__main__":
 
     settings = get_settings()
 
+    # uvloop (installed with uvicorn[standard]) runs the event loop shared by
+    # the web server and the tool schedulers; fall back to the stdlib loop
+    # where it isn't available (e.g. Windows)
+    try:
+        import uvloop  # noqa: F401
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+
     print("=" * 70)
     print("Starting UI Toolkit...")
     print("=" * 70)
@@ -232,6 +241,7 @@ if __name__ == "__main__":
     print(f"Version: {app_version}")
     print(f"Log Level: {settings.log_level}")
     print(f"Database: {settings.database_url}")
+    print(f"Event loop: {event_loop}")
     print()
 
     # Display deployment mode
@@ -270,6 +280,7 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=settings.app_port,
+        loop=event_loop,
         reload=False,  # Set to True for development
         log_level=log_level,
         access_log=True
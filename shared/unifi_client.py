@@ -1,7 +1,7 @@
 """
 UniFi API client wrapper using aiounifi
 """
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import aiohttp
 from aiounifi.controller import Controller
 from aiounifi.models.configuration import Configuration
@@ -201,6 +201,8 @@ class UniFiClient:
         # API key always means UniFi OS; otherwise we'll probe during connect
         self.is_unifi_os = api_key is not None
         self._detected_type: Optional[str] = None  # Track what we detected
+        # Last ETag and parsed body per site API path, for If-None-Match revalidation
+        self._etag_cache: Dict[str, Tuple[str, Dict]] = {}
 
     async def connect(self) -> bool:
         """
@@ -406,6 +408,59 @@ class UniFiClient:
         self._session = None
         self.controller = None
 
+    def _site_url(self, path: str) -> str:
+        """Build the site API URL for a path (e.g. stat/sta)"""
+        if self.is_unifi_os:
+            return f"{self.host}/proxy/network/api/s/{self.site}/{path}"
+        return f"{self.host}/api/s/{self.site}/{path}"
+
+    @staticmethod
+    def _conditional_headers(cached: Optional[Tuple[str, Dict]]) -> Optional[Dict[str, str]]:
+        """If-None-Match header for a cached (ETag, body) pair, if any"""
+        return {'If-None-Match': cached[0]} if cached else None
+
+    async def _read_json(
+        self,
+        path: str,
+        resp: aiohttp.ClientResponse,
+        cached: Optional[Tuple[str, Dict]]
+    ) -> Dict:
+        """
+        Read a site API JSON response, caching the body when it has an ETag
+
+        Args:
+            path: Site API path, e.g. "stat/sta"
+            resp: Response to read
+            cached: The (ETag, body) pair the request's If-None-Match was built
+                    from. A 304 returns this body, even if a concurrent fetch
+                    of the same path has since cached a newer one.
+        """
+        if resp.status == 304:
+            if not cached:
+                raise RuntimeError(f"Not Modified response to an unconditional request for {path}")
+            return cached[1]
+
+        data = await resp.json()
+        etag = resp.headers.get('ETag')
+        if etag:
+            self._etag_cache[path] = (etag, data)
+        else:
+            self._etag_cache.pop(path, None)
+        return data
+
+    def cached_etags(self, paths: Tuple[str, ...]) -> Tuple[Optional[str], ...]:
+        """
+        Get the ETag currently cached for each site API path
+
+        Reading these before and after a set of fetches tells whether every
+        response was a 304 or carried the same ETag, i.e. the controller data
+        for those paths is unchanged. Paths without an ETag give None.
+
+        Args:
+            paths: Site API paths, e.g. ("stat/sta",)
+        """
+        return tuple(self._etag_cache[path][0] if path in self._etag_cache else None for path in paths)
+
     async def get_clients(self) -> Dict:
         """
         Get all active clients from the UniFi controller
@@ -419,13 +474,14 @@ class UniFiClient:
         try:
             if self.is_unifi_os:
                 # UniFi OS - make direct API call
-                url = f"{self.host}/proxy/network/api/s/{self.site}/stat/sta"
-                async with self._session.get(url) as resp:
-                    if resp.status != 200:
+                path = "stat/sta"
+                cached = self._etag_cache.get(path)
+                async with self._session.get(self._site_url(path), headers=self._conditional_headers(cached)) as resp:
+                    if resp.status not in (200, 304):
                         logger.error(f"Failed to get clients: {resp.status}")
                         raise RuntimeError(f"API request failed: {resp.status}")
 
-                    data = await resp.json()
+                    data = await self._read_json(path, resp, cached)
                     clients_list = data.get('data', [])
 
                     # Convert to dictionary indexed by MAC
@@ -1150,14 +1206,11 @@ class UniFiClient:
             }
 
             # Get all devices
-            if self.is_unifi_os:
-                url = f"{self.host}/proxy/network/api/s/{self.site}/stat/device"
-            else:
-                url = f"{self.host}/api/s/{self.site}/stat/device"
-
-            async with self._session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
+            path = "stat/device"
+            cached = self._etag_cache.get(path)
+            async with self._session.get(self._site_url(path), headers=self._conditional_headers(cached)) as resp:
+                if resp.status in (200, 304):
+                    data = await self._read_json(path, resp, cached)
                     devices = data.get('data', [])
 
                     for device in devices:
@@ -1234,14 +1287,11 @@ class UniFiClient:
             raise RuntimeError("Not connected to UniFi controller. Call connect() first.")
 
         try:
-            if self.is_unifi_os:
-                url = f"{self.host}/proxy/network/api/s/{self.site}/stat/health"
-            else:
-                url = f"{self.host}/api/s/{self.site}/stat/health"
-
-            async with self._session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
+            path = "stat/health"
+            cached = self._etag_cache.get(path)
+            async with self._session.get(self._site_url(path), headers=self._conditional_headers(cached)) as resp:
+                if resp.status in (200, 304):
+                    data = await self._read_json(path, resp, cached)
                     health_list = data.get('data', [])
 
                     # Convert list to dict keyed by subsystem
@@ -1680,17 +1730,14 @@ class UniFiClient:
             raise RuntimeError("Not connected to UniFi controller. Call connect() first.")
 
         try:
-            if self.is_unifi_os:
-                url = f"{self.host}/proxy/network/api/s/{self.site}/stat/device"
-            else:
-                url = f"{self.host}/api/s/{self.site}/stat/device"
-
-            async with self._session.get(url) as resp:
-                if resp.status != 200:
+            path = "stat/device"
+            cached = self._etag_cache.get(path)
+            async with self._session.get(self._site_url(path), headers=self._conditional_headers(cached)) as resp:
+                if resp.status not in (200, 304):
                     logger.error(f"Failed to get AP details: {resp.status}")
                     return []
 
-                data = await resp.json()
+                data = await self._read_json(path, resp, cached)
                 devices = data.get('data', [])
 
                 # Filter for APs and extract relevant stats
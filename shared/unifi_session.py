@@ -12,8 +12,6 @@ invalidate the shared client so the next poll picks up new credentials.
 import logging
 from typing import Optional
 
-from sqlalchemy import select
-
 from shared.database import get_database
 from shared.models.unifi_config import UniFiConfig
 from shared.unifi_client import UniFiClient
@@ -53,17 +51,17 @@ async def get_shared_client() -> Optional[UniFiClient]:
             pass
         _shared_client = None
 
-    # Read config from DB
+    # Read config from DB. The loop body does no network I/O and runs to
+    # completion (no break or return), so the session is closed before the
+    # controller login below instead of being held for its duration.
+    client = None
     db_instance = get_database()
     async for session in db_instance.get_session():
-        config_result = await session.execute(
-            select(UniFiConfig).where(UniFiConfig.id == 1)
-        )
-        unifi_config = config_result.scalar_one_or_none()
+        unifi_config = await session.get(UniFiConfig, 1)
 
         if not unifi_config:
             logger.warning("No UniFi configuration found, cannot create shared session")
-            return None
+            continue
 
         # Decrypt credentials
         password = None
@@ -76,9 +74,9 @@ async def get_shared_client() -> Optional[UniFiClient]:
                 api_key = decrypt_api_key(unifi_config.api_key_encrypted)
         except Exception as e:
             logger.error(f"Failed to decrypt UniFi credentials: {e}")
-            return None
+            continue
 
-        # Create and connect client
+        # Create client
         client = UniFiClient(
             host=unifi_config.controller_url,
             username=unifi_config.username,
@@ -88,15 +86,18 @@ async def get_shared_client() -> Optional[UniFiClient]:
             verify_ssl=unifi_config.verify_ssl
         )
 
-        connected = await client.connect()
-        if not connected:
-            logger.error("Failed to connect shared UniFi session")
-            await client.disconnect()
-            return None
+    if client is None:
+        return None
+
+    # Connect client
+    connected = await client.connect()
+    if not connected:
+        logger.error("Failed to connect shared UniFi session")
+        await client.disconnect()
+        return None
 
-        _shared_client = client
-        logger.info("Shared UniFi session established")
-        break  # Exit the async for loop
+    _shared_client = client
+    logger.info("Shared UniFi session established")
 
     return _shared_client
 
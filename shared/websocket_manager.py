@@ -2,12 +2,19 @@
 WebSocket connection manager for real-time device updates
 """
 from fastapi import WebSocket
-from typing import List
+from typing import Any, Awaitable, Callable, List
+import asyncio
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum time a single client may take to accept a message before it is dropped
+SEND_TIMEOUT_SECONDS = 5.0
+
+# Maximum time to wait for a dropped client's socket to close
+CLOSE_TIMEOUT_SECONDS = 1.0
+
 
 class WebSocketManager:
     """
@@ -28,6 +35,38 @@ class WebSocketManager:
             self.active_connections.remove(websocket)
             logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
+    async def _send_to_all(self, send: Callable[[WebSocket], Awaitable[Any]]):
+        """
+        Send to all connected clients concurrently
+
+        Each send is bounded by SEND_TIMEOUT_SECONDS so one slow client can't
+        hold up the others. Clients that fail or time out are disconnected and
+        their socket is closed (a timed-out send may have been cancelled
+        mid-frame), so the browser sees the close and reconnects.
+
+        Args:
+            send: Called with each connection, returns the send coroutine
+        """
+        connections = list(self.active_connections)
+
+        async def send_one(connection: WebSocket):
+            try:
+                await asyncio.wait_for(send(connection), SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("WebSocket send timed out, dropping slow client")
+            except Exception as e:
+                logger.error(f"Error sending to WebSocket: {e}")
+            else:
+                return
+
+            self.disconnect(connection)
+            try:
+                await asyncio.wait_for(connection.close(), CLOSE_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+
+        await asyncio.gather(*(send_one(connection) for connection in connections))
+
     async def broadcast_device_update(self, device_data: dict):
         """
         Broadcast device update to all connected clients
@@ -43,18 +82,7 @@ class WebSocketManager:
             "device": device_data
         }
 
-        # Send to all connected clients
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
-
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        await self._send_to_all(lambda connection: connection.send_json(message))
 
     async def broadcast(self, data: dict):
         """
@@ -66,16 +94,21 @@ class WebSocketManager:
         if not self.active_connections:
             return
 
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(data)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
+        await self._send_to_all(lambda connection: connection.send_json(data))
 
-        for connection in disconnected:
-            self.disconnect(connection)
+    async def broadcast_raw(self, message: str):
+        """
+        Broadcast an already-serialized JSON message to all connected clients
+
+        Lets callers serialize once and share the result across connections.
+
+        Args:
+            message: JSON text to send as-is
+        """
+        if not self.active_connections:
+            return
+
+        await self._send_to_all(lambda connection: connection.send_text(message))
 
     async def broadcast_status_update(self, status_data: dict):
         """
@@ -92,18 +125,7 @@ class WebSocketManager:
             "status": status_data
         }
 
-        # Send to all connected clients
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
-
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        await self._send_to_all(lambda connection: connection.send_json(message))
 
 
 # Global WebSocket manager instance
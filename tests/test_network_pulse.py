@@ -0,0 +1,539 @@
+"""Tests for Network Pulse scheduler cache."""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from tools.network_pulse import scheduler
+from tools.network_pulse.models import (
+    DashboardData,
+    APStatus,
+    TopClient,
+    DeviceCounts,
+    serialize_datetime,
+)
+
+
+class FakeUniFiClient:
+    """Stand-in for UniFiClient returning canned controller data."""
+
+    def __init__(self, clients=None, fail=False):
+        self.clients = clients if clients is not None else {}
+        self.fail = fail
+        self.etags = {}
+
+    async def get_system_info(self):
+        if self.fail:
+            raise RuntimeError("API request failed: 401")
+        return {"gateway_model": "UDM Pro", "ap_count": 1, "switch_count": 0}
+
+    async def get_health(self):
+        return {"wan": {"status": "ok", "tx_bytes": 100, "rx_bytes": 200}}
+
+    async def get_ap_details(self):
+        return [{"mac": "aa:bb:cc:00:00:01", "name": "Office AP", "model": "U6 Pro"}]
+
+    async def get_clients(self):
+        return self.clients
+
+    def cached_etags(self, paths):
+        return tuple(self.etags.get(path) for path in paths)
+
+
+class FakeWebSocketManager:
+    """Stand-in for WebSocketManager recording broadcasts."""
+
+    def __init__(self):
+        self.broadcasts = []
+
+    async def broadcast_raw(self, message):
+        self.broadcasts.append(json.loads(message))
+
+
+@pytest.fixture
+def fake_ws_manager(monkeypatch):
+    """Patch the WebSocket manager with a FakeWebSocketManager."""
+    manager = FakeWebSocketManager()
+    monkeypatch.setattr(scheduler, "get_ws_manager", lambda: manager)
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def snapshot_path(monkeypatch, tmp_path):
+    """Keep the persisted snapshot inside the test's temp directory."""
+    path = tmp_path / "network_pulse_snapshot.json"
+    monkeypatch.setattr(scheduler, "SNAPSHOT_PATH", path)
+    return path
+
+
+@pytest.fixture
+def fake_controller(monkeypatch, fake_ws_manager):
+    """Patch the shared UniFi session with a FakeUniFiClient."""
+    client = FakeUniFiClient(clients={
+        "11:22:33:44:55:66": {
+            "mac": "11:22:33:44:55:66", "name": "Laptop", "radio": "na",
+            "essid": "Home", "tx_bytes": 1500, "rx_bytes": 500,
+            "ap_mac": "AA:BB:CC:00:00:01",
+        },
+        "11:22:33:44:55:77": {
+            "mac": "11:22:33:44:55:77", "hostname": "desktop", "is_wired": True,
+            "tx_bytes": None, "rx_bytes": 10,
+        },
+    })
+    invalidations = []
+
+    async def get_shared_client():
+        return client
+
+    async def invalidate_shared_client():
+        invalidations.append(True)
+
+    # Start every test from an empty cache
+    monkeypatch.setattr(scheduler, "_snapshot", None)
+    monkeypatch.setattr(scheduler, "_last_error", None)
+    monkeypatch.setattr(scheduler, "_last_digest", None)
+    monkeypatch.setattr(scheduler, "_last_etags", None)
+    monkeypatch.setattr(scheduler, "_last_api_request", None)
+    monkeypatch.setattr(scheduler, "_dashboard_connections", 1)
+
+    monkeypatch.setattr(scheduler, "get_shared_client", get_shared_client)
+    monkeypatch.setattr(scheduler, "invalidate_shared_client", invalidate_shared_client)
+    client.invalidations = invalidations
+    return client
+
+
+@pytest.fixture
+def dashboard_data():
+    """Dashboard data with one AP and two clients."""
+    return DashboardData(
+        devices=DeviceCounts(clients=2, wired_clients=1, wireless_clients=1, aps=1),
+        access_points=[
+            APStatus(mac="aa:bb:cc:00:00:01", name="Office AP", model="U6 Pro"),
+        ],
+        top_clients=[
+            TopClient(mac="11:22:33:44:55:66", name="Laptop", total_bytes=2000),
+        ],
+        all_clients=[
+            TopClient(mac="11:22:33:44:55:66", name="Laptop", total_bytes=2000),
+            TopClient(mac="11:22:33:44:55:77", name="Desktop", is_wired=True, total_bytes=10),
+        ],
+        last_refresh=datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+    )
+
+
+class TestJsonPayloads:
+    """Tests for pre-serialized endpoint payloads."""
+
+    def test_stats_payload_matches_model_dump(self, dashboard_data):
+        """Stats payload should decode to the same data as model_dump()."""
+        payloads = scheduler.build_snapshot(dashboard_data, dashboard_data.last_refresh).json_payloads
+
+        assert json.loads(payloads["stats"]) == dashboard_data.model_dump(mode="json")
+
+    def test_stats_payload_serializes_last_refresh_with_z_suffix(self, dashboard_data):
+        """last_refresh should use the ISO format with Z suffix."""
+        payloads = scheduler.build_snapshot(dashboard_data, dashboard_data.last_refresh).json_payloads
+
+        assert json.loads(payloads["stats"])["last_refresh"] == "2026-01-01T12:00:00Z"
+
+    def test_digest_ignores_last_refresh(self, dashboard_data):
+        """The digest should only change when the data itself changes."""
+        later = dashboard_data.model_copy(update={"last_refresh": datetime.now(timezone.utc)})
+        changed = dashboard_data.model_copy(update={"current_tx_rate": 42})
+
+        _, digest = scheduler.serialize_dashboard(dashboard_data)
+
+        assert scheduler.serialize_dashboard(later)[1] == digest
+        assert scheduler.serialize_dashboard(changed)[1] != digest
+
+    def test_list_payloads_are_wrapped(self, dashboard_data):
+        """AP and client payloads should be wrapped in their response keys."""
+        payloads = scheduler.build_snapshot(dashboard_data, dashboard_data.last_refresh).json_payloads
+
+        aps = json.loads(payloads["aps"])
+        clients = json.loads(payloads["clients"])
+
+        assert [ap["mac"] for ap in aps["access_points"]] == ["aa:bb:cc:00:00:01"]
+        assert [c["name"] for c in clients["top_clients"]] == ["Laptop"]
+
+    def test_devices_payload(self, dashboard_data):
+        """Devices payload should contain the device counts."""
+        payloads = scheduler.build_snapshot(dashboard_data, dashboard_data.last_refresh).json_payloads
+
+        assert json.loads(payloads["devices"])["wired_clients"] == 1
+
+
+class TestApIndexes:
+    """Tests for per-AP lookup indexes."""
+
+    def test_ap_index_keyed_by_lowercase_mac(self):
+        """APs should be indexed by lowercase MAC."""
+        ap = APStatus(mac="AA:BB:CC:00:00:01", name="Office AP", model="U6 Pro")
+
+        ap_index, _, _ = scheduler.build_ap_indexes([ap], [])
+
+        assert ap_index == {"aa:bb:cc:00:00:01": ap}
+
+    def test_ap_index_normalizes_dashed_mac(self):
+        """Dash-separated AP MACs should be indexed in colon form."""
+        ap = APStatus(mac="AA-BB-CC-00-00-01", name="Office AP", model="U6 Pro")
+        client = TopClient(mac="11:00:00:00:00:01", name="A", ap_mac="AA-BB-CC-00-00-01")
+
+        ap_index, clients_by_ap, _ = scheduler.build_ap_indexes([ap], [client])
+
+        key = scheduler.normalize_mac("aa-bb-cc-00-00-01")
+        assert ap_index[key] is ap
+        assert clients_by_ap[key] == [client]
+
+    def test_clients_grouped_by_ap_sorted_by_bandwidth(self):
+        """Clients should be grouped by AP MAC, highest total bandwidth first."""
+        clients = [
+            TopClient(mac="11:00:00:00:00:01", name="A", total_bytes=10, ap_mac="AA:BB:CC:00:00:01"),
+            TopClient(mac="11:00:00:00:00:02", name="B", ap_mac="aa:bb:cc:00:00:02"),
+            TopClient(mac="11:00:00:00:00:03", name="C", total_bytes=500, ap_mac="aa:bb:cc:00:00:01"),
+            TopClient(mac="11:00:00:00:00:04", name="D", is_wired=True),
+        ]
+
+        _, clients_by_ap, _ = scheduler.build_ap_indexes([], clients)
+
+        assert [c.name for c in clients_by_ap["aa:bb:cc:00:00:01"]] == ["C", "A"]
+        assert [c.name for c in clients_by_ap["aa:bb:cc:00:00:02"]] == ["B"]
+        assert len(clients_by_ap) == 2
+
+    def test_band_counts_per_ap(self):
+        """Band counts should be aggregated per AP."""
+        clients = [
+            TopClient(mac="11:00:00:00:00:01", name="A", radio="5 GHz", ap_mac="aa:bb:cc:00:00:01"),
+            TopClient(mac="11:00:00:00:00:02", name="B", radio="5 GHz", ap_mac="aa:bb:cc:00:00:01"),
+            TopClient(mac="11:00:00:00:00:03", name="C", ap_mac="aa:bb:cc:00:00:01"),
+        ]
+
+        _, _, band_counts = scheduler.build_ap_indexes([], clients)
+
+        assert band_counts == {"aa:bb:cc:00:00:01": {"5 GHz": 2, "Unknown": 1}}
+
+
+class TestRadioBandName:
+    """Tests for radio code to band name mapping."""
+
+    @pytest.mark.parametrize("radio,expected", [
+        ("ng", "2.4 GHz"),
+        ("NA", "5 GHz"),
+        ("ax", "5 GHz"),
+        ("6e", "6 GHz"),
+        ("zz", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_wireless_radio_codes(self, radio, expected):
+        """Radio codes should map case-insensitively to band names."""
+        assert scheduler.get_radio_band_name(radio, False) == expected
+
+    def test_wired_has_no_band(self):
+        """Wired clients should never have a radio band."""
+        assert scheduler.get_radio_band_name("ng", True) is None
+
+
+class TestBuildClientStats:
+    """Tests for the client aggregation pass."""
+
+    def test_aggregates_by_band_and_ssid(self):
+        """Clients should be counted by band and SSID, wired under 'Wired'."""
+        clients = {
+            "a": {"mac": "a", "radio": "ng", "essid": "Home"},
+            "b": {"mac": "b", "radio": "na", "essid": "Home"},
+            "c": {"mac": "c", "radio": "na", "essid": "Guest"},
+            "d": {"mac": "d", "is_wired": True},
+            "e": {"mac": "e", "radio": "zz"},
+        }
+
+        _, by_band, by_ssid, wired_count = scheduler.build_client_stats(clients)
+
+        assert by_band == {"2.4 GHz": 1, "5 GHz": 2, "Wired": 1, "Unknown": 1}
+        assert by_ssid == {"Home": 2, "Guest": 1, "Wired": 1}
+        assert wired_count == 1
+
+    def test_builds_clients_in_input_order(self):
+        """Client objects should follow input order with totals and name fallbacks."""
+        clients = {
+            "a": {"mac": "a", "name": "Phone", "tx_bytes": 5, "rx_bytes": None},
+            "b": {"mac": "b", "hostname": "nas"},
+            "c": {"mac": "c"},
+        }
+
+        all_clients, _, _, _ = scheduler.build_client_stats(clients)
+
+        assert [c.name for c in all_clients] == ["Phone", "nas", "c"]
+        assert all_clients[0].total_bytes == 5
+        assert all_clients[1].total_bytes == 0
+
+    def test_empty_clients(self):
+        """No clients should give empty results."""
+        assert scheduler.build_client_stats({}) == ([], {}, {}, 0)
+
+
+class TestRefreshNetworkStats:
+    """Tests for the refresh task."""
+
+    async def test_refresh_populates_cache(self, fake_controller):
+        """A successful refresh should cache dashboard data and payloads."""
+        await scheduler.refresh_network_stats()
+
+        assert scheduler.get_last_refresh() == scheduler.get_cached_data().last_refresh
+
+        cached = scheduler.get_cached_data()
+        assert cached.devices.clients == 2
+        assert cached.devices.wired_clients == 1
+        assert [c.name for c in cached.top_clients] == ["Laptop", "desktop"]
+        assert cached.chart_data.clients_by_band == {"5 GHz": 1, "Wired": 1}
+        assert json.loads(scheduler.get_cached_json("stats"))["devices"]["clients"] == 2
+        assert scheduler.get_last_error() is None
+
+    async def test_refresh_indexes_ap_clients(self, fake_controller):
+        """A successful refresh should index clients by their AP."""
+        await scheduler.refresh_network_stats()
+
+        snapshot = scheduler.get_snapshot()
+        assert snapshot.ap_index["aa:bb:cc:00:00:01"].name == "Office AP"
+        assert [c.name for c in snapshot.clients_by_ap["aa:bb:cc:00:00:01"]] == ["Laptop"]
+
+    async def test_controller_error_invalidates_session(self, fake_controller):
+        """A failed controller request should invalidate the shared session."""
+        fake_controller.fail = True
+
+        await scheduler.refresh_network_stats()
+
+        assert fake_controller.invalidations == [True]
+        assert "401" in scheduler.get_last_error()
+
+    async def test_build_error_keeps_session(self, fake_controller):
+        """An error while building the dashboard should not force a re-login."""
+        fake_controller.clients = {"bad": {"mac": "bad", "tx_bytes": "1", "rx_bytes": 2}}
+
+        await scheduler.refresh_network_stats()
+
+        assert fake_controller.invalidations == []
+        assert scheduler.get_last_error() is not None
+
+    async def test_slow_controller_request_times_out(self, fake_controller, monkeypatch):
+        """A controller request exceeding the fetch timeout should fail the refresh."""
+        async def slow_get_health():
+            await asyncio.sleep(1)
+            return {}
+
+        monkeypatch.setattr(scheduler, "FETCH_TIMEOUT_SECONDS", 0.01)
+        fake_controller.get_health = slow_get_health
+
+        await scheduler.refresh_network_stats()
+
+        assert fake_controller.invalidations == [True]
+        assert "timed out" in scheduler.get_last_error()
+
+    async def test_unchanged_data_is_not_rebroadcast(self, fake_controller, fake_ws_manager):
+        """A refresh with identical data should not broadcast again."""
+        await scheduler.refresh_network_stats()
+        await scheduler.refresh_network_stats()
+
+        assert len(fake_ws_manager.broadcasts) == 1
+
+    async def test_broadcast_message_format(self, fake_controller, fake_ws_manager):
+        """Broadcasts should wrap the stats payload in a stats_update message."""
+        await scheduler.refresh_network_stats()
+
+        message = fake_ws_manager.broadcasts[0]
+        assert message["type"] == "stats_update"
+        assert message["data"] == json.loads(scheduler.get_cached_json("stats"))
+
+    async def test_changed_data_is_broadcast(self, fake_controller, fake_ws_manager):
+        """A refresh with changed data should broadcast the update."""
+        await scheduler.refresh_network_stats()
+        fake_controller.clients["11:22:33:44:55:66"]["tx_bytes"] = 9999
+        await scheduler.refresh_network_stats()
+
+        assert len(fake_ws_manager.broadcasts) == 2
+
+    async def test_unchanged_etags_skip_rebuild(self, fake_controller):
+        """ETags unchanged since the snapshot was built should keep it and bump last_refresh."""
+        fake_controller.etags = {path: "v1" for path in scheduler.CONTROLLER_PATHS}
+        await scheduler.refresh_network_stats()
+        snapshot = scheduler.get_snapshot()
+
+        await scheduler.refresh_network_stats()
+
+        last_refresh = scheduler.get_last_refresh()
+        assert last_refresh > snapshot.last_refresh
+        assert scheduler.get_snapshot().data.all_clients is snapshot.data.all_clients
+        assert scheduler.get_cached_data().last_refresh == last_refresh
+
+        served = json.loads(scheduler.get_cached_json("stats"))
+        expected = json.loads(snapshot.json_payloads["stats"])
+        expected["last_refresh"] = serialize_datetime(last_refresh)
+        assert served == expected
+
+    async def test_changed_etag_rebuilds(self, fake_controller):
+        """A changed ETag for any controller path should rebuild the snapshot."""
+        fake_controller.etags = {path: "v1" for path in scheduler.CONTROLLER_PATHS}
+        await scheduler.refresh_network_stats()
+        snapshot = scheduler.get_snapshot()
+
+        fake_controller.etags["stat/sta"] = "v2"
+        await scheduler.refresh_network_stats()
+
+        assert scheduler.get_snapshot().data is not snapshot.data
+
+    async def test_etag_changed_during_fetch_rebuilds(self, fake_controller, monkeypatch):
+        """A snapshot built while an ETag changed mid-fetch should not be reused."""
+        fake_controller.etags = {path: "v1" for path in scheduler.CONTROLLER_PATHS}
+        get_clients = fake_controller.get_clients
+
+        async def get_clients_with_concurrent_update():
+            # Another tool's fetch of stat/sta gets a newer response meanwhile
+            fake_controller.etags["stat/sta"] = "v2"
+            return await get_clients()
+
+        monkeypatch.setattr(fake_controller, "get_clients", get_clients_with_concurrent_update)
+        await scheduler.refresh_network_stats()
+        snapshot = scheduler.get_snapshot()
+
+        monkeypatch.setattr(fake_controller, "get_clients", get_clients)
+        await scheduler.refresh_network_stats()
+
+        assert scheduler.get_snapshot().data is not snapshot.data
+
+    async def test_missing_etag_rebuilds(self, fake_controller):
+        """A path without an ETag (e.g. a controller that sends none) should always rebuild."""
+        fake_controller.etags = {"stat/device": "v1", "stat/health": "v1"}
+        await scheduler.refresh_network_stats()
+        snapshot = scheduler.get_snapshot()
+
+        await scheduler.refresh_network_stats()
+
+        assert scheduler.get_snapshot().data is not snapshot.data
+
+    async def test_idle_refresh_is_skipped(self, fake_controller, fake_ws_manager):
+        """Without dashboards connected, refreshes within the idle interval are skipped."""
+        await scheduler.refresh_network_stats()
+        scheduler.dashboard_disconnected()
+        fake_controller.fail = True
+
+        await scheduler.refresh_network_stats()
+
+        assert fake_controller.invalidations == []
+        assert scheduler.get_last_error() is None
+
+    async def test_recent_api_request_prevents_idle_skip(self, fake_controller, fake_ws_manager):
+        """A recent stats API request should count as activity without dashboards connected."""
+        await scheduler.refresh_network_stats()
+        scheduler.dashboard_disconnected()
+        fake_controller.fail = True
+        scheduler.record_api_request()
+
+        await scheduler.refresh_network_stats()
+
+        assert fake_controller.invalidations == [True]
+
+
+class TestRefreshLoop:
+    """Tests for starting and stopping the background refresh task."""
+
+    @pytest.fixture
+    def refresh_calls(self, monkeypatch):
+        """Replace the refresh with a counter and shorten the interval."""
+        calls = []
+
+        async def refresh_network_stats(force=False):
+            calls.append(True)
+
+        monkeypatch.setattr(scheduler, "refresh_network_stats", refresh_network_stats)
+        monkeypatch.setattr(scheduler, "REFRESH_INTERVAL_SECONDS", 0.01)
+        monkeypatch.setattr(scheduler, "_refresh_task", None)
+        monkeypatch.setattr(scheduler, "_snapshot", None)
+        return calls
+
+    async def test_start_refreshes_immediately(self, refresh_calls):
+        """Starting should run one refresh before returning."""
+        await scheduler.start_scheduler()
+        try:
+            assert len(refresh_calls) >= 1
+        finally:
+            await scheduler.stop_scheduler()
+
+    async def test_refreshes_periodically_until_stopped(self, refresh_calls):
+        """The task should keep refreshing until stopped."""
+        await scheduler.start_scheduler()
+        await asyncio.sleep(0.1)
+        await scheduler.stop_scheduler()
+        count = len(refresh_calls)
+
+        await asyncio.sleep(0.05)
+
+        assert count > 2
+        assert len(refresh_calls) == count
+        assert scheduler._refresh_task is None
+
+    async def test_loop_survives_refresh_errors(self, refresh_calls, monkeypatch):
+        """An unexpected refresh error should not end the loop."""
+        async def failing_refresh(force=False):
+            refresh_calls.append(True)
+            raise RuntimeError("boom")
+
+        await scheduler.start_scheduler()
+        monkeypatch.setattr(scheduler, "refresh_network_stats", failing_refresh)
+        await asyncio.sleep(0.1)
+
+        try:
+            assert len(refresh_calls) > 2
+            assert not scheduler._refresh_task.done()
+        finally:
+            await scheduler.stop_scheduler()
+
+
+class TestPersistedSnapshot:
+    """Tests for persisting the snapshot across restarts."""
+
+    async def test_refresh_saves_snapshot(self, fake_controller, snapshot_path):
+        """A refresh should persist the stats payload to disk."""
+        await scheduler.refresh_network_stats()
+
+        assert snapshot_path.read_bytes() == scheduler.get_cached_json("stats")
+
+    async def test_load_restores_snapshot(self, fake_controller, monkeypatch):
+        """A saved snapshot should load back with its data, indexes and timestamp."""
+        await scheduler.refresh_network_stats()
+        saved = scheduler.get_snapshot()
+        monkeypatch.setattr(scheduler, "_snapshot", None)
+
+        loaded = scheduler.load_snapshot()
+
+        assert loaded.data.model_dump() == saved.data.model_dump()
+        assert loaded.json_payloads["stats"] == saved.json_payloads["stats"]
+        assert loaded.last_refresh == saved.last_refresh
+        assert "aa:bb:cc:00:00:01" in loaded.ap_index
+
+    def test_load_without_file(self):
+        """Should return None when nothing has been saved."""
+        assert scheduler.load_snapshot() is None
+
+    def test_load_ignores_corrupt_file(self, snapshot_path):
+        """An unreadable snapshot file should be ignored."""
+        snapshot_path.write_bytes(b"{not json")
+
+        assert scheduler.load_snapshot() is None
+
+    async def test_start_serves_saved_snapshot_when_refresh_fails(
+        self, fake_controller, monkeypatch
+    ):
+        """On startup the saved snapshot should be served if the first refresh fails."""
+        await scheduler.refresh_network_stats()
+        saved = scheduler.get_snapshot()
+        monkeypatch.setattr(scheduler, "_snapshot", None)
+        monkeypatch.setattr(scheduler, "_refresh_task", None)
+        fake_controller.fail = True
+
+        await scheduler.start_scheduler()
+        try:
+            assert scheduler.get_last_refresh() == saved.last_refresh
+            assert scheduler.get_cached_json("stats") == saved.json_payloads["stats"]
+        finally:
+            await scheduler.stop_scheduler()
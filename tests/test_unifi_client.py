@@ -0,0 +1,68 @@
+"""Tests for UniFiClient response revalidation."""
+import pytest
+
+from shared.unifi_client import UniFiClient
+
+
+class FakeResponse:
+    """Stand-in for an aiohttp response."""
+
+    def __init__(self, status=200, body=None, etag=None):
+        self.status = status
+        self.body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    async def json(self):
+        return self.body
+
+
+@pytest.fixture
+def client():
+    """UniFi OS client (no connection needed for these helpers)."""
+    return UniFiClient("https://192.168.1.1", api_key="key")
+
+
+class TestConditionalRequests:
+    """Tests for ETag caching and revalidation."""
+
+    async def test_etag_response_is_revalidated(self, client):
+        """A 304 should return the body cached with the ETag."""
+        body = {"data": [{"subsystem": "wan"}]}
+
+        assert client._conditional_headers(client._etag_cache.get("stat/health")) is None
+        response = FakeResponse(body=body, etag='"abc"')
+        assert await client._read_json("stat/health", response, None) == body
+
+        cached = client._etag_cache.get("stat/health")
+        assert client._conditional_headers(cached) == {"If-None-Match": '"abc"'}
+        assert await client._read_json("stat/health", FakeResponse(status=304), cached) == body
+
+    async def test_not_modified_returns_body_of_own_request(self, client):
+        """A 304 should return its own request's body even after a newer ETag was cached."""
+        old_body = {"data": [{"name": "old"}]}
+        new_body = {"data": [{"name": "new"}]}
+        await client._read_json("stat/device", FakeResponse(body=old_body, etag='"v1"'), None)
+
+        # Both fetches build their request from the v1 entry
+        first = client._etag_cache.get("stat/device")
+        second = client._etag_cache.get("stat/device")
+
+        # The first gets a newer body, the second a 304 for v1
+        await client._read_json("stat/device", FakeResponse(body=new_body, etag='"v2"'), first)
+        assert await client._read_json("stat/device", FakeResponse(status=304), second) == old_body
+        assert client.cached_etags(("stat/device",)) == ('"v2"',)
+
+    async def test_response_without_etag_is_not_cached(self, client):
+        """A response without an ETag should drop the cached body."""
+        await client._read_json("stat/sta", FakeResponse(body={"data": []}, etag='"abc"'), None)
+        cached = client._etag_cache.get("stat/sta")
+        await client._read_json("stat/sta", FakeResponse(body={"data": []}), cached)
+
+        assert client._etag_cache.get("stat/sta") is None
+        assert client.cached_etags(("stat/sta",)) == (None,)
+
+    async def test_cached_etags(self, client):
+        """cached_etags should return the cached ETag per path, None if missing."""
+        await client._read_json("stat/device", FakeResponse(body={"data": []}, etag='"dev"'), None)
+
+        assert client.cached_etags(("stat/device", "stat/sta")) == ('"dev"', None)
@@ -0,0 +1,81 @@
+"""Tests for the shared UniFi session."""
+import pytest
+
+from shared import unifi_session
+from shared.crypto import encrypt_password
+from shared.models.unifi_config import UniFiConfig
+
+
+class FakeSession:
+    """Stand-in for AsyncSession returning a single UniFiConfig row."""
+
+    def __init__(self, config):
+        self.config = config
+        self.closed = False
+
+    async def get(self, model, ident):
+        return self.config if model is UniFiConfig and ident == 1 else None
+
+
+class FakeDatabase:
+    """Stand-in for Database yielding one FakeSession."""
+
+    def __init__(self, config):
+        self.session = FakeSession(config)
+
+    async def get_session(self):
+        try:
+            yield self.session
+        finally:
+            self.session.closed = True
+
+
+@pytest.fixture
+def fake_database(monkeypatch):
+    """Patch the database with one UniFi config row."""
+    config = UniFiConfig(
+        id=1,
+        controller_url="https://192.168.1.1",
+        username="admin",
+        password_encrypted=encrypt_password("secret"),
+        site_id="default",
+        verify_ssl=False,
+    )
+    database = FakeDatabase(config)
+    monkeypatch.setattr(unifi_session, "get_database", lambda: database)
+    monkeypatch.setattr(unifi_session, "_shared_client", None)
+    return database
+
+
+class TestGetSharedClient:
+    """Tests for creating the shared client."""
+
+    async def test_db_session_closed_before_connect(self, fake_database, monkeypatch):
+        """The DB session should be released before the controller login."""
+        session_closed_at_connect = []
+
+        async def connect(self):
+            session_closed_at_connect.append(fake_database.session.closed)
+            return True
+
+        monkeypatch.setattr(unifi_session.UniFiClient, "connect", connect)
+
+        client = await unifi_session.get_shared_client()
+
+        assert client is not None
+        assert client.password == "secret"
+        assert session_closed_at_connect == [True]
+
+    async def test_returns_none_without_config(self, fake_database):
+        """Should return None when no UniFi config is stored."""
+        fake_database.session.config = None
+
+        assert await unifi_session.get_shared_client() is None
+        assert fake_database.session.closed
+
+    async def test_returns_none_when_decrypt_fails(self, fake_database):
+        """Should return None, closing the DB session, when credentials can't be decrypted."""
+        fake_database.session.config.password_encrypted = "not-encrypted"
+
+        assert await unifi_session.get_shared_client() is None
+        assert fake_database.session.closed
@@ -0,0 +1,75 @@
+"""Tests for the shared WebSocket manager."""
+import asyncio
+
+import pytest
+
+from shared import websocket_manager
+from shared.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Stand-in for a WebSocket connection."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(message)
+
+    async def send_json(self, data):
+        await self.send_text(data)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Manager with a short send timeout."""
+    monkeypatch.setattr(websocket_manager, "SEND_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(websocket_manager, "CLOSE_TIMEOUT_SECONDS", 0.05)
+    return WebSocketManager()
+
+
+class TestBroadcast:
+    """Tests for broadcasting to connected clients."""
+
+    async def test_sends_text_to_all(self, manager):
+        """Every client should receive the message as a text frame."""
+        clients = [FakeWebSocket(), FakeWebSocket()]
+        manager.active_connections.extend(clients)
+
+        await manager.broadcast_raw('{"type":"stats_update"}')
+
+        assert [c.sent for c in clients] == [['{"type":"stats_update"}']] * 2
+
+    async def test_sends_concurrently(self, manager):
+        """Slow clients should not delay each other."""
+        clients = [FakeWebSocket(delay=0.03) for _ in range(5)]
+        manager.active_connections.extend(clients)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await manager.broadcast({"type": "ping"})
+
+        assert loop.time() - start < 0.1
+        assert all(c.sent == [{"type": "ping"}] for c in clients)
+
+    async def test_drops_slow_and_failed_clients(self, manager):
+        """Clients that time out or error should be disconnected and closed."""
+        healthy = FakeWebSocket()
+        slow = FakeWebSocket(delay=1.0)
+        broken = FakeWebSocket(fail=True)
+        manager.active_connections.extend([healthy, slow, broken])
+
+        await manager.broadcast_raw("{}")
+
+        assert manager.active_connections == [healthy]
+        assert healthy.sent == ["{}"]
+        assert (healthy.closed, slow.closed, broken.closed) == (False, True, True)
@@ -10,7 +10,13 @@ import logging
 from tools.network_pulse import __version__
 from tools.network_pulse.routers import stats
 from tools.network_pulse.models import SystemStatus
-from tools.network_pulse.scheduler import get_last_refresh, get_last_error, get_cached_data
+from tools.network_pulse.scheduler import (
+    get_last_refresh,
+    get_last_error,
+    get_cached_data,
+    dashboard_connected,
+    dashboard_disconnected
+)
 from shared.websocket_manager import get_ws_manager
 from app.routers.auth import is_auth_enabled, verify_session
 
@@ -93,6 +99,8 @@ def create_app() -> FastAPI:
 
         ws_manager = get_ws_manager()
         await ws_manager.connect(websocket)
+        # Counted separately: the shared manager also holds other tools' sockets
+        dashboard_connected()
 
         try:
             while True:
@@ -106,5 +114,7 @@ def create_app() -> FastAPI:
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
             ws_manager.disconnect(websocket)
+        finally:
+            dashboard_disconnected()
 
     return app
@@ -120,7 +120,7 @@ class DashboardData(BaseModel):
     # Top clients (top 10 by bandwidth for display)
     top_clients: List[TopClient] = Field(default_factory=list)
 
-    # All clients (for AP detail pages and chart aggregation)
+    # All clients, unsorted (for AP detail pages and chart aggregation)
     all_clients: List[TopClient] = Field(default_factory=list)
 
     # Chart data (aggregated client stats)
@@ -1,13 +1,39 @@
 """
 API endpoints for Network Pulse dashboard data
+
+Every request counts as dashboard activity, so the scheduler keeps refreshing
+at the normal interval while the API is being polled. The first request after
+an idle period may see data up to IDLE_REFRESH_SECONDS old.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Optional
 
-from tools.network_pulse.scheduler import get_cached_data, get_last_refresh, get_last_error
+from tools.network_pulse.scheduler import (
+    get_cached_json,
+    get_snapshot,
+    normalize_mac,
+    get_last_refresh,
+    get_last_error,
+    record_api_request,
+    CLIENT_ROWS_ADAPTER
+)
 from tools.network_pulse.models import DashboardData, SystemStatus
 
-router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+async def _record_activity():
+    """Mark each stats request as dashboard activity for the scheduler"""
+    record_api_request()
+
+
+router = APIRouter(prefix="/api/stats", tags=["stats"], dependencies=[Depends(_record_activity)])
+
+
+def _cached_response(key: str, detail: str = "Data not available") -> Response:
+    """Return the pre-serialized JSON payload for key, or 503 if not yet cached"""
+    content = get_cached_json(key)
+    if content is None:
+        raise HTTPException(status_code=503, detail=detail)
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("", response_model=DashboardData)
@@ -24,22 +50,16 @@ async def get_stats():
     - Top clients by bandwidth
     - Network health by subsystem
     """
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Dashboard data not yet available. Please wait for initial refresh."
-        )
-    return cached
+    return _cached_response(
+        "stats",
+        detail="Dashboard data not yet available. Please wait for initial refresh."
+    )
 
 
 @router.get("/gateway")
 async def get_gateway_stats():
     """Get just the gateway health statistics"""
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return cached.gateway
+    return _cached_response("gateway")
 
 
 @router.get("/bandwidth")
@@ -52,50 +72,31 @@ async def get_bandwidth_stats():
     - current_rx_rate: Current download rate (bytes/sec)
     - bandwidth_history: List of hourly data points
     """
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return {
-        "current_tx_rate": cached.current_tx_rate,
-        "current_rx_rate": cached.current_rx_rate,
-        "bandwidth_history": [p.model_dump() for p in cached.bandwidth_history]
-    }
+    return _cached_response("bandwidth")
 
 
 @router.get("/aps")
 async def get_ap_stats():
     """Get access point status list"""
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return {"access_points": [ap.model_dump() for ap in cached.access_points]}
+    return _cached_response("aps")
 
 
 @router.get("/clients")
 async def get_top_clients():
     """Get top clients by bandwidth usage"""
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return {"top_clients": [c.model_dump() for c in cached.top_clients]}
+    return _cached_response("clients")
 
 
 @router.get("/health")
 async def get_network_health():
     """Get network health by subsystem"""
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return cached.health.model_dump()
+    return _cached_response("health")
 
 
 @router.get("/devices")
 async def get_device_counts():
     """Get device counts summary"""
-    cached = get_cached_data()
-    if cached is None:
-        raise HTTPException(status_code=503, detail="Data not available")
-    return cached.devices.model_dump()
+    return _cached_response("devices")
 
 
 @router.get("/ap/{ap_mac}")
@@ -111,42 +112,20 @@ async def get_ap_detail(ap_mac: str):
         - clients: List of clients connected to this AP
         - clients_by_band: Radio band distribution for this AP
     """
-    cached = get_cached_data()
-    if cached is None:
+    snapshot = get_snapshot()
+    if snapshot is None:
         raise HTTPException(status_code=503, detail="Data not available")
 
-    # Normalize MAC for comparison (lowercase with colons)
-    ap_mac_normalized = ap_mac.lower().replace('-', ':')
-
-    # Find the AP
-    ap_info = None
-    for ap in cached.access_points:
-        if ap.mac.lower() == ap_mac_normalized:
-            ap_info = ap
-            break
+    ap_mac_normalized = normalize_mac(ap_mac)
 
+    ap_info = snapshot.ap_index.get(ap_mac_normalized)
     if ap_info is None:
         raise HTTPException(status_code=404, detail="AP not found")
 
-    # Filter clients for this AP
-    ap_clients = [
-        client for client in cached.all_clients
-        if client.ap_mac and client.ap_mac.lower() == ap_mac_normalized
-    ]
-
-    # Aggregate by band for this AP
-    clients_by_band = {}
-    for client in ap_clients:
-        if client.is_wired:
-            band_key = "Wired"
-        elif client.radio:
-            band_key = client.radio
-        else:
-            band_key = "Unknown"
-        clients_by_band[band_key] = clients_by_band.get(band_key, 0) + 1
-
     return {
         "ap_info": ap_info.model_dump(),
-        "clients": [c.model_dump() for c in ap_clients],
-        "clients_by_band": clients_by_band
+        "clients": CLIENT_ROWS_ADAPTER.dump_python(
+            snapshot.clients_by_ap.get(ap_mac_normalized, [])
+        ),
+        "clients_by_band": snapshot.ap_clients_by_band.get(ap_mac_normalized, {})
     }
@@ -2,11 +2,17 @@
 Background task scheduler for refreshing network stats
 """
 import asyncio
+import hashlib
+import heapq
+import json
 import logging
+import os
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import Optional, Dict, List
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+from pydantic import TypeAdapter
 from sqlalchemy import select
 
 from shared.database import get_database
@@ -21,31 +27,115 @@ from tools.network_pulse.models import (
     APStatus,
     TopClient,
     NetworkHealth,
-    ChartData
+    ChartData,
+    serialize_datetime
 )
 
 logger = logging.getLogger(__name__)
 
-# Global scheduler instance
-_scheduler: AsyncIOScheduler = None
-_last_refresh: datetime = None
+# Interval between network stats refreshes
+REFRESH_INTERVAL_SECONDS = 60
+
+# Maximum time to wait for each UniFi controller request during a refresh
+FETCH_TIMEOUT_SECONDS = 30
+
+# Refresh interval while no Network Pulse dashboard is connected over
+# WebSocket and the stats API hasn't been requested within this interval either
+IDLE_REFRESH_SECONDS = 300
+
+# Controller API paths a refresh is built from, checked for unchanged ETags
+CONTROLLER_PATHS = ("stat/device", "stat/health", "stat/sta")
+
+# Last dashboard data, persisted so a restart can serve it before the first refresh
+SNAPSHOT_PATH = Path("./data/network_pulse_snapshot.json")
+
+
+@dataclass(frozen=True)
+class CacheSnapshot:
+    """
+    Everything published by one successful refresh.
+
+    A refresh builds a new snapshot and swaps it in with a single assignment,
+    so readers never see data from one refresh mixed with indexes or payloads
+    from another.
+    """
+    data: DashboardData
+    # Pre-serialized JSON payloads for the stats endpoints
+    json_payloads: Dict[str, bytes]
+    # Per-AP lookups for the AP detail endpoint, keyed by normalized AP MAC
+    ap_index: Dict[str, APStatus]
+    clients_by_ap: Dict[str, List[TopClient]]
+    ap_clients_by_band: Dict[str, Dict[str, int]]
+    last_refresh: datetime
+    # Hash of the data excluding last_refresh, to detect unchanged refreshes
+    digest: bytes
+
+
+# Background refresh task
+_refresh_task: Optional[asyncio.Task] = None
 _last_error: Optional[str] = None
 
-# In-memory cache for dashboard data
-_cached_data: Optional[DashboardData] = None
+# Latest published snapshot, None until the first successful refresh
+_snapshot: Optional[CacheSnapshot] = None
+
+# Batch serializers for the list payloads (one pydantic-core call per list)
+_DASHBOARD_ADAPTER = TypeAdapter(DashboardData)
+_AP_LIST_ADAPTER = TypeAdapter(Dict[str, List[APStatus]])
+_CLIENT_LIST_ADAPTER = TypeAdapter(Dict[str, List[TopClient]])
+
+# Client list adapter: builds all client models from plain rows in one
+# pydantic-core call, and serializes client lists for the AP detail endpoint
+CLIENT_ROWS_ADAPTER = TypeAdapter(List[TopClient])
+
+# Digest of the last broadcast dashboard data, to skip unchanged broadcasts
+_last_digest: Optional[bytes] = None
 
+# Controller ETags the current snapshot was built from, None if unknown
+_last_etags: Optional[Tuple[Optional[str], ...]] = None
 
-def get_scheduler() -> AsyncIOScheduler:
-    """Get the global scheduler instance"""
-    global _scheduler
-    if _scheduler is None:
-        _scheduler = AsyncIOScheduler()
-    return _scheduler
+# Monotonic time of the last stats API request, None if never requested
+_last_api_request: Optional[float] = None
+
+# Open Network Pulse dashboard WebSockets. The WebSocket manager is shared by
+# all tools, so its connection list also holds other tools' pages.
+_dashboard_connections = 0
 
 
 def get_last_refresh() -> Optional[datetime]:
     """Get the timestamp of the last successful refresh"""
-    return _last_refresh
+    return _snapshot.last_refresh if _snapshot else None
+
+
+def dashboard_connected():
+    """Record a Network Pulse dashboard WebSocket connecting"""
+    global _dashboard_connections
+    _dashboard_connections += 1
+
+
+def dashboard_disconnected():
+    """Record a Network Pulse dashboard WebSocket disconnecting"""
+    global _dashboard_connections
+    _dashboard_connections = max(0, _dashboard_connections - 1)
+
+
+def record_api_request():
+    """
+    Record a stats API request as dashboard activity.
+
+    HTTP-only consumers (the AP detail page, external /api/stats pollers)
+    have no WebSocket, so without this they would only see data refreshed
+    at the idle interval.
+    """
+    global _last_api_request
+    _last_api_request = time.monotonic()
+
+
+def _api_requested_recently() -> bool:
+    """Whether the stats API was requested within the idle interval"""
+    return (
+        _last_api_request is not None
+        and time.monotonic() - _last_api_request < IDLE_REFRESH_SECONDS
+    )
 
 
 def get_last_error() -> Optional[str]:
@@ -53,29 +143,284 @@ def get_last_error() -> Optional[str]:
     return _last_error
 
 
+def get_snapshot() -> Optional[CacheSnapshot]:
+    """Get the latest cache snapshot"""
+    return _snapshot
+
+
 def get_cached_data() -> Optional[DashboardData]:
     """Get the cached dashboard data"""
-    return _cached_data
+    return _snapshot.data if _snapshot else None
+
+
+def get_cached_json(key: str) -> Optional[bytes]:
+    """Get a pre-serialized JSON payload (e.g. "stats", "aps") from the cache"""
+    return _snapshot.json_payloads.get(key) if _snapshot else None
+
+
+def normalize_mac(mac: str) -> str:
+    """Normalize a MAC address for lookups (lowercase with colons)"""
+    return mac.lower().replace('-', ':')
+
+
+def build_ap_indexes(
+    access_points: List[APStatus],
+    all_clients: List[TopClient]
+) -> Tuple[Dict[str, APStatus], Dict[str, List[TopClient]], Dict[str, Dict[str, int]]]:
+    """
+    Index APs and their clients by normalized AP MAC in a single pass.
+
+    MACs are normalized here, once per refresh, so lookups are a single
+    dict access on the normalized request MAC.
+
+    Returns:
+        Tuple of (AP by MAC, clients by AP MAC, band counts by AP MAC).
+        Client lists are sorted by total bandwidth descending.
+    """
+    ap_index = {normalize_mac(ap.mac): ap for ap in access_points}
+    clients_by_ap: Dict[str, List[TopClient]] = {}
+    clients_by_band: Dict[str, Dict[str, int]] = {}
+
+    for client in all_clients:
+        if not client.ap_mac:
+            continue
+        ap_mac = normalize_mac(client.ap_mac)
+        clients_by_ap.setdefault(ap_mac, []).append(client)
+
+        if client.is_wired:
+            band_key = "Wired"
+        elif client.radio:
+            band_key = client.radio
+        else:
+            band_key = "Unknown"
+        band_counts = clients_by_band.setdefault(ap_mac, {})
+        band_counts[band_key] = band_counts.get(band_key, 0) + 1
+
+    # Sort each AP's (small) client list rather than the full client list
+    for ap_clients in clients_by_ap.values():
+        ap_clients.sort(key=lambda c: c.total_bytes, reverse=True)
+
+    return ap_index, clients_by_ap, clients_by_band
+
+
+def build_snapshot(data: DashboardData, last_refresh: datetime) -> CacheSnapshot:
+    """Build the cache snapshot (payloads and AP indexes) for dashboard data"""
+    stats_json, digest = serialize_dashboard(data)
+    ap_index, clients_by_ap, ap_clients_by_band = build_ap_indexes(
+        data.access_points, data.all_clients
+    )
+    return CacheSnapshot(
+        data=data,
+        json_payloads=build_json_payloads(data, stats_json),
+        ap_index=ap_index,
+        clients_by_ap=clients_by_ap,
+        ap_clients_by_band=ap_clients_by_band,
+        last_refresh=last_refresh,
+        digest=digest
+    )
+
+
+def _write_snapshot_file(content: bytes):
+    """Atomically write the persisted snapshot (temp file + rename)"""
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, SNAPSHOT_PATH)
+
+
+async def save_snapshot(snapshot: CacheSnapshot):
+    """Persist the snapshot's dashboard data to SNAPSHOT_PATH"""
+    try:
+        await asyncio.to_thread(_write_snapshot_file, snapshot.json_payloads["stats"])
+    except OSError as e:
+        logger.warning(f"Could not save Network Pulse snapshot: {e}")
+
+
+def load_snapshot() -> Optional[CacheSnapshot]:
+    """
+    Load the persisted dashboard data from SNAPSHOT_PATH.
+
+    The snapshot keeps its original last_refresh, so the dashboard shows how
+    stale the data is until the first refresh replaces it.
+
+    Returns:
+        CacheSnapshot, or None if there is no usable snapshot file
+    """
+    if not SNAPSHOT_PATH.exists():
+        return None
+    try:
+        data = DashboardData.model_validate_json(SNAPSHOT_PATH.read_bytes())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable Network Pulse snapshot: {e}")
+        return None
+    if data.last_refresh is None:
+        return None
+    return build_snapshot(data, data.last_refresh)
+
+
+def serialize_dashboard(data: DashboardData) -> Tuple[bytes, bytes]:
+    """
+    Serialize dashboard data to JSON once and hash it for change detection.
+
+    The data is dumped without last_refresh, hashed, and then the timestamp is
+    appended, so the digest doesn't need a second full serialization.
+
+    Returns:
+        Tuple of (JSON bytes including last_refresh, digest without it)
+    """
+    body = _DASHBOARD_ADAPTER.dump_json(data, exclude={'last_refresh'})
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    return _splice_last_refresh(body, data.last_refresh), digest
+
+
+def _splice_last_refresh(body: bytes, last_refresh: datetime) -> bytes:
+    """Append last_refresh to dashboard JSON that was dumped without it"""
+    return body[:-1] + b',"last_refresh":' + _dumps(serialize_datetime(last_refresh)) + b'}'
+
+
+def touch_snapshot(snapshot: CacheSnapshot, last_refresh: datetime) -> CacheSnapshot:
+    """
+    Copy a snapshot with a new last_refresh, without rebuilding it.
+
+    Used when the controller data is unchanged. The timestamp is re-spliced
+    into the stats payload so it matches data.last_refresh and /status.
+    """
+    stats_json = snapshot.json_payloads["stats"]
+    body = stats_json[:stats_json.rindex(b',"last_refresh":')] + b'}'
+    return replace(
+        snapshot,
+        data=snapshot.data.model_copy(update={'last_refresh': last_refresh}),
+        json_payloads={**snapshot.json_payloads, "stats": _splice_last_refresh(body, last_refresh)},
+        last_refresh=last_refresh
+    )
+
+
+def _dumps(payload) -> bytes:
+    """Serialize a plain payload to compact JSON bytes"""
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def build_json_payloads(data: DashboardData, stats_json: bytes) -> Dict[str, bytes]:
+    """
+    Serialize dashboard data once for every stats endpoint.
+
+    The data only changes on each scheduler refresh, so endpoints serve these
+    bytes directly instead of re-running model_dump() on every request.
+
+    Args:
+        data: Dashboard data
+        stats_json: The full dashboard JSON from serialize_dashboard()
+    """
+    return {
+        "stats": stats_json,
+        "gateway": data.gateway.model_dump_json().encode('utf-8'),
+        "bandwidth": _dumps({
+            "current_tx_rate": data.current_tx_rate,
+            "current_rx_rate": data.current_rx_rate,
+            "bandwidth_history": []
+        }),
+        "aps": _AP_LIST_ADAPTER.dump_json({"access_points": data.access_points}),
+        "clients": _CLIENT_LIST_ADAPTER.dump_json({"top_clients": data.top_clients}),
+        "health": data.health.model_dump_json().encode('utf-8'),
+        "devices": data.devices.model_dump_json().encode('utf-8'),
+    }
+
+
+# UniFi radio code (lowercase) -> friendly band name
+_RADIO_BAND = {
+    'ng': "2.4 GHz", '2g': "2.4 GHz", 'b': "2.4 GHz", 'g': "2.4 GHz",
+    'na': "5 GHz", '5g': "5 GHz", 'a': "5 GHz", 'ac': "5 GHz", 'ax': "5 GHz",
+    '6e': "6 GHz", '6g': "6 GHz",
+}
 
 
 def get_radio_band_name(radio: str, is_wired: bool) -> Optional[str]:
     """Convert UniFi radio code to friendly band name"""
-    if is_wired:
+    if is_wired or not radio:
         return None  # Wired clients don't have a radio band
-    if not radio:
-        return None
+    return _RADIO_BAND.get(radio.lower())  # None for unknown radio types
+
+
+def build_client_stats(
+    clients: Dict[str, Dict]
+) -> Tuple[List[TopClient], Dict[str, int], Dict[str, int], int]:
+    """
+    Build client objects and aggregate counts in a single pass over clients.
 
-    radio_lower = radio.lower()
-    if radio_lower in ('ng', '2g', 'b', 'g'):
-        return "2.4 GHz"
-    elif radio_lower in ('na', '5g', 'a', 'ac', 'ax'):
-        return "5 GHz"
-    elif radio_lower in ('6e', '6g'):
-        return "6 GHz"
-    return None  # Unknown radio type
+    This is the hottest loop of a refresh on large sites, so globals and
+    bound methods are aliased to locals and the row list is pre-sized. The
+    loop only builds plain dicts; the TopClient models are then created from
+    all rows in a single pydantic-core call, which is several times faster
+    than constructing them one by one in Python.
 
+    Args:
+        clients: Client dicts from UniFiClient.get_clients()
 
-async def refresh_network_stats():
+    Returns:
+        Tuple of (all clients, clients by band, clients by SSID, wired count)
+    """
+    rows: List[Optional[Dict]] = [None] * len(clients)
+    clients_by_band: Dict[str, int] = {}
+    clients_by_ssid: Dict[str, int] = {}
+    wired_count = 0
+
+    band_name = get_radio_band_name
+
+    for i, client_data in enumerate(clients.values()):
+        get = client_data.get
+        is_wired = get('is_wired', False)
+        radio_band = band_name(get('radio'), is_wired)
+        essid = get('essid')
+        mac = get('mac', '')
+        hostname = get('hostname')
+
+        # Handle None values for bytes
+        tx_bytes = get('tx_bytes') or 0
+        rx_bytes = get('rx_bytes') or 0
+
+        rows[i] = {
+            'mac': mac,
+            'name': get('name') or hostname or mac,
+            'hostname': hostname,
+            'ip': get('ip'),
+            'tx_bytes': tx_bytes,
+            'rx_bytes': rx_bytes,
+            'total_bytes': tx_bytes + rx_bytes,
+            'rssi': get('rssi'),
+            'is_wired': is_wired,
+            'uptime': get('uptime'),
+            'essid': essid,
+            'network': get('network'),
+            'radio': radio_band,
+            'ap_mac': get('ap_mac')
+        }
+
+        # Aggregate by band
+        if is_wired:
+            band_key = "Wired"
+            wired_count += 1
+        elif radio_band:
+            band_key = radio_band
+        else:
+            band_key = "Unknown"
+        try:
+            clients_by_band[band_key] += 1
+        except KeyError:
+            clients_by_band[band_key] = 1
+
+        # Aggregate by SSID
+        if essid or is_wired:
+            ssid_key = essid or "Wired"
+            try:
+                clients_by_ssid[ssid_key] += 1
+            except KeyError:
+                clients_by_ssid[ssid_key] = 1
+
+    all_clients_list = CLIENT_ROWS_ADAPTER.validate_python(rows)
+    return all_clients_list, clients_by_band, clients_by_ssid, wired_count
+
+
+async def refresh_network_stats(force: bool = False):
     """
     Background task that runs periodically to update network statistics.
 
@@ -85,8 +430,25 @@ async def refresh_network_stats():
     - Hourly bandwidth history
     - AP status and client counts
     - Top clients by bandwidth
+
+    Args:
+        force: Refresh even when no dashboard is connected (used at startup)
     """
-    global _last_refresh, _last_error, _cached_data
+    global _snapshot, _last_error, _last_digest, _last_etags
+
+    # Nobody is watching (no Network Pulse dashboard connected, no recent API
+    # requests): refresh at the slower idle interval only
+    ws_manager = get_ws_manager()
+    last_refresh = get_last_refresh()
+    if (
+        not force
+        and _dashboard_connections == 0
+        and not _api_requested_recently()
+        and last_refresh is not None
+        and (datetime.now(timezone.utc) - last_refresh).total_seconds() < IDLE_REFRESH_SECONDS
+    ):
+        logger.debug("No dashboard activity, skipping network stats refresh")
+        return
 
     try:
         logger.info("Starting network stats refresh")
@@ -100,25 +462,53 @@ async def refresh_network_stats():
 
         logger.info("Using shared UniFi session, fetching data...")
 
-        # Fetch all data in parallel where possible
-        system_info_task = unifi_client.get_system_info()
-        health_task = unifi_client.get_health()
-        ap_details_task = unifi_client.get_ap_details()
-        top_clients_task = unifi_client.get_top_clients(limit=10)
-
-        # Await all tasks
-        system_info, health, ap_details, top_clients = await asyncio.gather(
-            system_info_task,
-            health_task,
-            ap_details_task,
-            top_clients_task
-        )
+        # ETags cached before the fetch; compared afterwards to tell whether
+        # every response was a 304 (or repeated the same ETag)
+        etags_before = unifi_client.cached_etags(CONTROLLER_PATHS)
+
+        # Fetch all data in parallel, each request bounded so one slow
+        # endpoint can't stall the whole refresh
+        try:
+            system_info, health, ap_details, clients = await asyncio.gather(
+                asyncio.wait_for(unifi_client.get_system_info(), FETCH_TIMEOUT_SECONDS),
+                asyncio.wait_for(unifi_client.get_health(), FETCH_TIMEOUT_SECONDS),
+                asyncio.wait_for(unifi_client.get_ap_details(), FETCH_TIMEOUT_SECONDS),
+                asyncio.wait_for(unifi_client.get_clients(), FETCH_TIMEOUT_SECONDS)
+            )
+        except asyncio.TimeoutError:
+            await invalidate_shared_client()
+            raise RuntimeError(
+                f"UniFi controller request timed out after {FETCH_TIMEOUT_SECONDS}s"
+            ) from None
+        except Exception:
+            # Only controller request failures invalidate the shared session so the
+            # next cycle reconnects (handles session expiry). Errors while building
+            # the dashboard below keep the session, avoiding a needless re-login.
+            await invalidate_shared_client()
+            raise
+
+        # The ETags only identify the data this refresh fetched if every path
+        # had one and none changed during the fetch (the client is shared, so
+        # other tools may fetch the same paths meanwhile). Controllers that
+        # don't send ETags always rebuild.
+        etags = unifi_client.cached_etags(CONTROLLER_PATHS)
+        if etags != etags_before or None in etags:
+            etags = None
+
+        # Every path answered 304 for the data the current snapshot was built
+        # from: keep it and skip the rebuild
+        if _snapshot is not None and etags is not None and etags == _last_etags:
+            _snapshot = touch_snapshot(_snapshot, datetime.now(timezone.utc))
+            _last_error = None
+            logger.debug("Controller data unchanged, keeping current network stats")
+            return
 
-        # Build dashboard data
+        # Build dashboard data. Controller data is already normalized by
+        # UniFiClient, so models are constructed without re-validation.
         settings = get_settings()
 
         # Gateway stats
-        gateway = GatewayStats(
+        gateway = GatewayStats.model_construct(
             model=system_info.get('gateway_model'),
             name=system_info.get('gateway_name'),
             version=system_info.get('gateway_version'),
@@ -131,32 +521,21 @@ async def refresh_network_stats():
 
         # WAN health
         wan_health_data = health.get('wan', {})
-        wan = WanHealth(
+        current_tx_rate = int(wan_health_data.get('tx_bytes') or 0)
+        current_rx_rate = int(wan_health_data.get('rx_bytes') or 0)
+        wan = WanHealth.model_construct(
             status=wan_health_data.get('status', 'unknown'),
             wan_ip=wan_health_data.get('wan_ip'),
             isp_name=wan_health_data.get('isp_name'),
             availability=wan_health_data.get('availability'),
             latency=health.get('www', {}).get('latency'),
-            tx_bytes_rate=wan_health_data.get('tx_bytes', 0),
-            rx_bytes_rate=wan_health_data.get('rx_bytes', 0)
-        )
-
-        # Device counts
-        clients = await unifi_client.get_clients()
-        wired_count = sum(1 for c in clients.values() if c.get('is_wired', False))
-        wireless_count = len(clients) - wired_count
-
-        devices = DeviceCounts(
-            clients=len(clients),
-            wired_clients=wired_count,
-            wireless_clients=wireless_count,
-            aps=system_info.get('ap_count', 0),
-            switches=system_info.get('switch_count', 0)
+            tx_bytes_rate=current_tx_rate,
+            rx_bytes_rate=current_rx_rate
         )
 
         # AP status list
         access_points = [
-            APStatus(
+            APStatus.model_construct(
                 mac=ap.get('mac', ''),
                 name=ap.get('name', 'Unknown'),
                 model=ap.get('model', 'Unknown'),
@@ -174,86 +553,29 @@ async def refresh_network_stats():
             for ap in ap_details
         ]
 
-        # Top clients (top 10 for display)
-        top_clients_list = [
-            TopClient(
-                mac=client.get('mac', ''),
-                name=client.get('name', 'Unknown'),
-                hostname=client.get('hostname'),
-                ip=client.get('ip'),
-                tx_bytes=client.get('tx_bytes', 0),
-                rx_bytes=client.get('rx_bytes', 0),
-                total_bytes=client.get('total_bytes', 0),
-                rssi=client.get('rssi'),
-                is_wired=client.get('is_wired', False),
-                uptime=client.get('uptime'),
-                essid=client.get('essid'),
-                network=client.get('network'),
-                radio=get_radio_band_name(client.get('radio', ''), client.get('is_wired', False)),
-                ap_mac=client.get('ap_mac')
-            )
-            for client in top_clients
-        ]
+        # All clients list (for AP detail pages and top clients), built in one pass
+        all_clients_list, clients_by_band, clients_by_ssid, wired_count = build_client_stats(clients)
 
-        # All clients list (for AP detail pages)
-        all_clients_list = []
-        clients_by_band: Dict[str, int] = {}
-        clients_by_ssid: Dict[str, int] = {}
-
-        for client_data in clients.values():
-            is_wired = client_data.get('is_wired', False)
-            radio_band = get_radio_band_name(client_data.get('radio', ''), is_wired)
-            essid = client_data.get('essid')
-
-            # Handle None values for bytes
-            tx_bytes = client_data.get('tx_bytes') or 0
-            rx_bytes = client_data.get('rx_bytes') or 0
-
-            # Build client object
-            client_obj = TopClient(
-                mac=client_data.get('mac', ''),
-                name=client_data.get('name') or client_data.get('hostname') or 'Unknown',
-                hostname=client_data.get('hostname'),
-                ip=client_data.get('ip'),
-                tx_bytes=tx_bytes,
-                rx_bytes=rx_bytes,
-                total_bytes=tx_bytes + rx_bytes,
-                rssi=client_data.get('rssi'),
-                is_wired=is_wired,
-                uptime=client_data.get('uptime'),
-                essid=essid,
-                network=client_data.get('network'),
-                radio=radio_band,
-                ap_mac=client_data.get('ap_mac')
-            )
-            all_clients_list.append(client_obj)
-
-            # Aggregate by band
-            if is_wired:
-                band_key = "Wired"
-            elif radio_band:
-                band_key = radio_band
-            else:
-                band_key = "Unknown"
-            clients_by_band[band_key] = clients_by_band.get(band_key, 0) + 1
-
-            # Aggregate by SSID
-            if essid:
-                clients_by_ssid[essid] = clients_by_ssid.get(essid, 0) + 1
-            elif is_wired:
-                clients_by_ssid["Wired"] = clients_by_ssid.get("Wired", 0) + 1
-
-        # Sort all_clients by total bandwidth descending
-        all_clients_list.sort(key=lambda c: c.total_bytes, reverse=True)
+        # Top 10 clients by total bandwidth for display (no need to sort them all)
+        top_clients_list = heapq.nlargest(10, all_clients_list, key=lambda c: c.total_bytes)
+
+        # Device counts
+        devices = DeviceCounts.model_construct(
+            clients=len(clients),
+            wired_clients=wired_count,
+            wireless_clients=len(clients) - wired_count,
+            aps=system_info.get('ap_count', 0),
+            switches=system_info.get('switch_count', 0)
+        )
 
         # Build chart data
-        chart_data = ChartData(
+        chart_data = ChartData.model_construct(
             clients_by_band=clients_by_band,
             clients_by_ssid=clients_by_ssid
         )
 
         # Network health
-        network_health = NetworkHealth(
+        network_health = NetworkHealth.model_construct(
             wan=health.get('wan'),
             wan2=health.get('wan2'),
             lan=health.get('lan'),
@@ -263,22 +585,25 @@ async def refresh_network_stats():
         )
 
         # Build complete dashboard data
-        _cached_data = DashboardData(
+        now = datetime.now(timezone.utc)
+        dashboard_data = DashboardData.model_construct(
             gateway=gateway,
             wan=wan,
             devices=devices,
-            current_tx_rate=wan_health_data.get('tx_bytes', 0),
-            current_rx_rate=wan_health_data.get('rx_bytes', 0),
+            current_tx_rate=current_tx_rate,
+            current_rx_rate=current_rx_rate,
             access_points=access_points,
             top_clients=top_clients_list,
             all_clients=all_clients_list,
             chart_data=chart_data,
             health=network_health,
-            last_refresh=datetime.now(timezone.utc),
-            refresh_interval=60
+            last_refresh=now,
+            refresh_interval=REFRESH_INTERVAL_SECONDS
         )
 
-        _last_refresh = datetime.now(timezone.utc)
+        # Publish everything at once
+        _snapshot = build_snapshot(dashboard_data, now)
+        _last_etags = etags
         _last_error = None
 
         logger.info(
@@ -286,46 +611,74 @@ async def refresh_network_stats():
             f"{devices.clients} clients, {devices.aps} APs"
         )
 
-        # Broadcast update via WebSocket
-        ws_manager = get_ws_manager()
-        await ws_manager.broadcast({
-            "type": "stats_update",
-            "data": _cached_data.model_dump()
-        })
+        # Broadcast update via WebSocket, only if something changed. On a live
+        # site client/AP uptimes and byte counters differ on nearly every
+        # refresh, so this mainly skips broadcasts for quiet or empty sites.
+        if _snapshot.digest == _last_digest:
+            logger.debug("Network stats unchanged, skipping broadcast")
+            return
+        _last_digest = _snapshot.digest
+
+        await save_snapshot(_snapshot)
+
+        # Reuse the cached stats payload instead of dumping the models again
+        await ws_manager.broadcast_raw(
+            '{"type":"stats_update","data":' + _snapshot.json_payloads["stats"].decode('utf-8') + '}'
+        )
 
     except Exception as e:
         logger.error(f"Error in network stats refresh: {e}", exc_info=True)
         _last_error = str(e)
-        # Invalidate shared session so next cycle reconnects (handles session expiry)
-        await invalidate_shared_client()
 
 
-async def start_scheduler():
-    """Start the background scheduler"""
-    scheduler = get_scheduler()
-
-    # Add the refresh job - 60 second interval
-    scheduler.add_job(
-        refresh_network_stats,
-        trigger=IntervalTrigger(seconds=60),
-        id="refresh_network_stats",
-        name="Refresh network statistics",
-        replace_existing=True,
-        misfire_grace_time=None,
-        max_instances=1
-    )
+async def _refresh_loop():
+    """Refresh network stats every REFRESH_INTERVAL_SECONDS until cancelled"""
+    loop = asyncio.get_running_loop()
+    next_run = loop.time() + REFRESH_INTERVAL_SECONDS
 
-    # Start the scheduler
-    scheduler.start()
-    logger.info("Network Pulse scheduler started with 60 second refresh interval")
+    while True:
+        await asyncio.sleep(max(0.0, next_run - loop.time()))
+        # Schedule from the start of this run so refresh time doesn't add drift
+        next_run = loop.time() + REFRESH_INTERVAL_SECONDS
+        try:
+            await refresh_network_stats()
+        except Exception as e:
+            logger.error(f"Unexpected error in Network Pulse refresh loop: {e}", exc_info=True)
+
+
+async def start_scheduler():
+    """Start the background refresh task"""
+    global _refresh_task, _snapshot
+
+    # Serve the data persisted before the last shutdown until the first refresh
+    if _snapshot is None:
+        _snapshot = load_snapshot()
+        if _snapshot is not None:
+            logger.info(
+                f"Loaded Network Pulse snapshot from {_snapshot.last_refresh.isoformat()}"
+            )
 
     # Run the refresh task immediately on startup
-    await refresh_network_stats()
+    await refresh_network_stats(force=True)
+
+    # A single fixed-interval job doesn't need APScheduler; a plain task
+    # avoids its job store and executor overhead on every tick
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_loop())
+    logger.info(
+        f"Network Pulse scheduler started with {REFRESH_INTERVAL_SECONDS} second refresh interval"
+    )
 
 
 async def stop_scheduler():
-    """Stop the background scheduler"""
-    scheduler = get_scheduler()
-    if scheduler.running:
-        scheduler.shutdown()
+    """Stop the background refresh task"""
+    global _refresh_task
+
+    if _refresh_task is not None and not _refresh_task.done():
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
         logger.info("Network Pulse scheduler stopped")
+    _refresh_task = None